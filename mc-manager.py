@@ -4,17 +4,31 @@ Minecraft Manager - A command-line tool for managing Minecraft resource packs, s
 using the Modrinth API.
 """
 
+# Networking and concurrency modules (requests, aiohttp, asyncio, ...) are imported
+# where they are used, so commands like `list` and `--help` start quickly
 import os
 import sys
 import json
-import shutil
-import zipfile
-import argparse
+import sqlite3
+import hashlib
 import platform
-import requests
+import threading
+import functools
+import itertools
+import importlib
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+
+# Optional: faster JSON parsing and serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Terminal colors
 class Colors:
@@ -27,6 +41,16 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
     END = '\033[0m'
+    
+    @classmethod
+    def disable(cls):
+        """Replace every color code with an empty string"""
+        for name in list(vars(cls)):
+            if name.isupper():
+                setattr(cls, name, "")
+
+# Row template for list_installed
+INSTALLED_ROW_FMT = "{name:<40} {version:<20} {date}\n"
 
 # Content types
 class ContentType(Enum):
@@ -34,7 +58,15 @@ class ContentType(Enum):
     RESOURCE_PACK = "resourcepack"
     SHADER_PACK = "shader"
 
+def import_optional(name: str):
+    """Import an optional dependency, returning None if it is not installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
 # Default Minecraft paths based on OS
+@functools.lru_cache(maxsize=None)
 def get_default_minecraft_path() -> Path:
     system = platform.system().lower()
     home = Path.home()
@@ -46,106 +78,380 @@ def get_default_minecraft_path() -> Path:
     else:  # Linux and others
         return home / ".minecraft"
 
+def get_primary_file(files: List[Dict]) -> Optional[Dict]:
+    """Get the primary file of a version, falling back to the first file"""
+    for f in files:
+        if f.get("primary"):
+            return f
+    return files[0] if files else None
+
+class HashingWriter:
+    """File wrapper that feeds everything written through it into a hash"""
+    
+    def __init__(self, f, hasher):
+        self.f = f
+        self.hasher = hasher
+    
+    def write(self, data: bytes) -> int:
+        self.hasher.update(data)
+        return self.f.write(data)
+
+def load_json(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def create_session(user_agent: str, cache_path: Path = None) -> "requests.Session":
+    """Create an HTTP session that pools connections and retries transient errors.
+    
+    If cache_path is given and requests-cache is installed, API responses are cached
+    there in SQLite, honouring the server's caching headers. Such a session must not be
+    used for file downloads: caching headers override the URL rules below.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+    
+    requests_cache = import_optional("requests_cache") if cache_path is not None else None
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            str(cache_path),
+            backend="sqlite",
+            cache_control=True,
+            stale_if_error=True,
+            urls_expire_after={
+                "api.modrinth.com/*": 300,
+                "*": requests_cache.DO_NOT_CACHE
+            }
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({"User-Agent": user_agent})
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+    return session
+
 class ModrinthAPI:
     """Interface for the Modrinth API"""
     BASE_URL = "https://api.modrinth.com/v2"
     USER_AGENT = "MinecraftManager/1.0.0"
+    MAX_CONCURRENCY = 8
+    # Longest encoded ids=[...] parameter per bulk request, well under URL length limits
+    MAX_IDS_PARAM_LENGTH = 4000
+    # Responses at least this large are stream-parsed when ijson is installed
+    STREAM_PARSE_THRESHOLD = 64 * 1024
+    DOWNLOAD_BUFFER_SIZE = 1 << 20
+    
+    # Shared by all calls so keep-alive connections and TLS sessions are reused;
+    # created on first use. Downloads get their own session that never caches.
+    _session = None
+    _download_session = None
+    _cache_path = None
+    _session_lock = threading.Lock()
+    
+    @staticmethod
+    def enable_cache(cache_path: Path):
+        """Cache API responses in the given SQLite file (requires requests-cache)"""
+        with ModrinthAPI._session_lock:
+            ModrinthAPI._cache_path = cache_path
+            ModrinthAPI._session = None
+    
+    @staticmethod
+    def get_session() -> "requests.Session":
+        """Get the shared HTTP session, creating it on first use"""
+        # Locked so worker threads racing on the first call share one session
+        with ModrinthAPI._session_lock:
+            if ModrinthAPI._session is None:
+                ModrinthAPI._session = create_session(ModrinthAPI.USER_AGENT, ModrinthAPI._cache_path)
+            return ModrinthAPI._session
+    
+    @staticmethod
+    def get_download_session() -> "requests.Session":
+        """Get the shared uncached HTTP session for file downloads, creating it on first use"""
+        with ModrinthAPI._session_lock:
+            if ModrinthAPI._download_session is None:
+                ModrinthAPI._download_session = create_session(ModrinthAPI.USER_AGENT)
+            return ModrinthAPI._download_session
     
     @staticmethod
     def search(query: str, content_type: ContentType, 
                game_versions: List[str] = None, limit: int = 20) -> Dict:
         """Search for content on Modrinth"""
-        # Map content type to Modrinth project type
-        project_type = None
-        if content_type == ContentType.MOD:
-            project_type = "mod"
-        elif content_type == ContentType.RESOURCE_PACK:
-            project_type = "resourcepack"
-        elif content_type == ContentType.SHADER_PACK:
-            facets = [["project_type:shader"]]
-            project_type = None
-        
-        # Build facets for filtering
-        facets = []
-        if project_type:
-            facets.append([f"project_type:{project_type}"])
+        import requests
+        import urllib3
+        
+        ijson = import_optional("ijson")
+        errors = (requests.RequestException, urllib3.exceptions.HTTPError, ValueError)
+        if ijson is not None:
+            errors += (ijson.JSONError,)
+        
+        # Build facets for filtering; content type values match Modrinth project types
+        facets = [[f"project_type:{content_type.value}"]]
         if game_versions:
             versions_facet = [f"versions:{v}" for v in game_versions]
             facets.append(versions_facet)
             
         # Make API request
-        headers = {"User-Agent": ModrinthAPI.USER_AGENT}
         params = {
             "query": query,
             "limit": limit,
-            "facets": json.dumps(facets) if facets else None
+            "facets": dump_json(facets).decode()
         }
         
         try:
-            response = requests.get(
+            with ModrinthAPI.get_session().get(
                 f"{ModrinthAPI.BASE_URL}/search", 
-                headers=headers, 
-                params=params
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+                params=params,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                size = int(response.headers.get("Content-Length") or 0)
+                # Cached (requests-cache) or already-read bodies can no longer be read from raw
+                already_read = getattr(response, "from_cache", False) or getattr(response, "_content_consumed", False)
+                if ijson is None or already_read or 0 < size < ModrinthAPI.STREAM_PARSE_THRESHOLD:
+                    return load_json(response.content)
+                
+                # Build hits as they arrive and stop reading once we have enough
+                response.raw.decode_content = True
+                hits = ijson.items(response.raw, "hits.item", use_float=True)
+                return {"hits": list(itertools.islice(hits, limit))}
+        except errors as e:
             print(f"{Colors.RED}Error searching Modrinth: {e}{Colors.END}")
             return {"hits": []}
     
     @staticmethod
     def get_project(project_id: str) -> Dict:
         """Get project details by ID"""
-        headers = {"User-Agent": ModrinthAPI.USER_AGENT}
+        import requests
+        
         try:
-            response = requests.get(
-                f"{ModrinthAPI.BASE_URL}/project/{project_id}", 
-                headers=headers
+            response = ModrinthAPI.get_session().get(
+                f"{ModrinthAPI.BASE_URL}/project/{project_id}"
             )
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return load_json(response.content)
+        except (requests.RequestException, ValueError) as e:
             print(f"{Colors.RED}Error fetching project: {e}{Colors.END}")
             return {}
     
     @staticmethod
     def get_versions(project_id: str, game_version: str = None) -> List[Dict]:
         """Get versions of a project"""
-        headers = {"User-Agent": ModrinthAPI.USER_AGENT}
+        import requests
+        
         params = {}
         if game_version:
             params["game_versions"] = f"[\"{game_version}\"]"
             
         try:
-            response = requests.get(
+            response = ModrinthAPI.get_session().get(
                 f"{ModrinthAPI.BASE_URL}/project/{project_id}/version", 
-                headers=headers,
                 params=params
             )
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return load_json(response.content)
+        except (requests.RequestException, ValueError) as e:
             print(f"{Colors.RED}Error fetching versions: {e}{Colors.END}")
             return []
     
     @staticmethod
-    def download_file(url: str, destination: Path) -> bool:
-        """Download a file from URL to destination"""
-        headers = {"User-Agent": ModrinthAPI.USER_AGENT}
+    def _batch_ids(ids: List[str]) -> List[List[str]]:
+        """Split IDs into batches whose URL-encoded ids=[...] parameter fits MAX_IDS_PARAM_LENGTH"""
+        from urllib.parse import quote
+        
+        batches = []
+        batch, length = [], len(quote("[]"))
+        for object_id in ids:
+            # Quoted ID plus the separating comma
+            id_length = len(quote(dump_json(object_id).decode())) + len(quote(","))
+            if batch and length + id_length > ModrinthAPI.MAX_IDS_PARAM_LENGTH:
+                batches.append(batch)
+                batch, length = [], len(quote("[]"))
+            batch.append(object_id)
+            length += id_length
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    @staticmethod
+    def _get_bulk(endpoint: str, ids: List[str]) -> List[Dict]:
+        """Fetch objects by ID from a bulk endpoint such as /projects, batches in parallel"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        session = ModrinthAPI.get_session()
+        
+        def fetch(batch: List[str]) -> List[Dict]:
+            response = session.get(
+                f"{ModrinthAPI.BASE_URL}/{endpoint}",
+                params={"ids": dump_json(batch).decode()}
+            )
+            response.raise_for_status()
+            return load_json(response.content)
+        
+        batches = ModrinthAPI._batch_ids(ids)
+        if len(batches) <= 1:
+            return [obj for batch in batches for obj in fetch(batch)]
+        with ThreadPoolExecutor(max_workers=ModrinthAPI.MAX_CONCURRENCY) as executor:
+            return [obj for objects in executor.map(fetch, batches) for obj in objects]
+    
+    @staticmethod
+    def get_versions_bulk(project_ids: List[str]) -> Optional[Dict[str, List[Dict]]]:
+        """Get the versions of several projects, newest first, keyed by the requested ID or slug.
+        
+        Returns None if the lookup failed.
+        """
+        import requests
+        
         try:
-            with requests.get(url, headers=headers, stream=True) as r:
+            projects = ModrinthAPI._get_bulk("projects", list(dict.fromkeys(project_ids)))
+            # A project requested by both ID and slug is returned twice
+            version_ids = list(dict.fromkeys(vid for project in projects for vid in project.get("versions", [])))
+            versions = ModrinthAPI._get_bulk("versions", version_ids)
+        except (requests.RequestException, ValueError) as e:
+            print(f"{Colors.RED}Error fetching versions: {e}{Colors.END}")
+            return None
+        
+        # Content installed by slug is recorded under the slug, so map each version
+        # back to every ID or slug its project was requested as
+        requested_ids = set(project_ids)
+        requested_slugs = {}
+        for pid in project_ids:
+            requested_slugs.setdefault(pid.lower(), []).append(pid)
+        
+        keys_by_version = {}
+        for project in projects:
+            keys = set(requested_slugs.get(project.get("slug", "").lower(), []))
+            if project["id"] in requested_ids:
+                keys.add(project["id"])
+            for vid in project.get("versions", []):
+                keys_by_version[vid] = keys
+        
+        # Match the order of /project/{id}/version
+        versions.sort(key=lambda v: v["date_published"], reverse=True)
+        versions_by_project = {}
+        for version in versions:
+            for key in keys_by_version.get(version["id"], ()):
+                versions_by_project.setdefault(key, []).append(version)
+        return versions_by_project
+    
+    @staticmethod
+    def _resume_headers(part_path: Path) -> Dict:
+        """Get the Range header that resumes a partial download, if there is one"""
+        if part_path.exists():
+            return {"Range": f"bytes={part_path.stat().st_size}-"}
+        return {}
+    
+    @staticmethod
+    def _start_hash(part_path: Path, resumed: bool):
+        """Create the SHA-512 hash of a download, seeded with the bytes already on disk"""
+        sha512 = hashlib.sha512()
+        if resumed:
+            with open(part_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(ModrinthAPI.DOWNLOAD_BUFFER_SIZE), b""):
+                    sha512.update(chunk)
+        return sha512
+    
+    @staticmethod
+    def _complete_download(part_path: Path, destination: Path, sha512, expected_size: int = None,
+                           expected_sha512: str = None) -> bool:
+        """Move a finished partial download into place after checking its size and hash"""
+        if expected_size is not None and part_path.stat().st_size != expected_size:
+            print(f"{Colors.RED}Error downloading file: expected {expected_size} bytes, "
+                  f"got {part_path.stat().st_size}{Colors.END}")
+            part_path.unlink()
+            return False
+        if expected_sha512 is not None and sha512.hexdigest() != expected_sha512.lower():
+            print(f"{Colors.RED}Error downloading file: SHA-512 mismatch for {destination.name}{Colors.END}")
+            part_path.unlink()
+            return False
+        os.replace(part_path, destination)
+        return True
+    
+    @staticmethod
+    def download_file(url: str, destination: Path, expected_size: int = None,
+                      expected_sha512: str = None) -> bool:
+        """Download a file from URL to destination, resuming an interrupted download"""
+        import shutil
+        import requests
+        import urllib3
+        
+        part_path = destination.with_name(destination.name + ".part")
+        headers = ModrinthAPI._resume_headers(part_path)
+        try:
+            with ModrinthAPI.get_download_session().get(url, headers=headers, stream=True) as r:
+                if r.status_code == 416:
+                    # The partial file does not match the remote file, start over
+                    part_path.unlink()
+                    return ModrinthAPI.download_file(url, destination, expected_size, expected_sha512)
                 r.raise_for_status()
-                with open(destination, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-            return True
-        except requests.RequestException as e:
+                r.raw.decode_content = True
+                # Append only if the server honoured the range request
+                resumed = r.status_code == 206
+                sha512 = ModrinthAPI._start_hash(part_path, resumed)
+                with open(part_path, 'ab' if resumed else 'wb') as f:
+                    # Hash while writing so the file is never read back
+                    shutil.copyfileobj(r.raw, HashingWriter(f, sha512), length=ModrinthAPI.DOWNLOAD_BUFFER_SIZE)
+            return ModrinthAPI._complete_download(part_path, destination, sha512,
+                                                  expected_size, expected_sha512)
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            # Reading r.raw directly surfaces urllib3 errors unwrapped
+            print(f"{Colors.RED}Error downloading file: {e}{Colors.END}")
+            return False
+
+    @staticmethod
+    async def download_file_async(session: "aiohttp.ClientSession", url: str, destination: Path,
+                                  expected_size: int = None, expected_sha512: str = None) -> bool:
+        """Download a file from URL to destination using an aiohttp session"""
+        import asyncio
+        import aiohttp
+        
+        # Disk work runs on the default executor so it never stalls the other downloads
+        loop = asyncio.get_running_loop()
+        part_path = destination.with_name(destination.name + ".part")
+        headers = ModrinthAPI._resume_headers(part_path)
+        try:
+            async with session.get(url, headers=headers) as r:
+                if r.status == 416:
+                    part_path.unlink()
+                    return await ModrinthAPI.download_file_async(session, url, destination,
+                                                                 expected_size, expected_sha512)
+                r.raise_for_status()
+                resumed = r.status == 206
+                sha512 = await loop.run_in_executor(None, ModrinthAPI._start_hash, part_path, resumed)
+                with open(part_path, 'ab' if resumed else 'wb') as f:
+                    writer = HashingWriter(f, sha512)
+                    async for chunk in r.content.iter_chunked(ModrinthAPI.DOWNLOAD_BUFFER_SIZE):
+                        await loop.run_in_executor(None, writer.write, chunk)
+            return await loop.run_in_executor(None, ModrinthAPI._complete_download, part_path, destination,
+                                              sha512, expected_size, expected_sha512)
+        except aiohttp.ClientError as e:
             print(f"{Colors.RED}Error downloading file: {e}{Colors.END}")
             return False
 
 class MinecraftManager:
     """Main class for managing Minecraft content"""
     
+    __slots__ = (
+        "minecraft_path", "mods_path", "resourcepacks_path", "shaderpacks_path",
+        "db_path", "config_path", "db", "_paths"
+    )
+    
+    # Keys of each content type in the JSON config format
+    CONFIG_KEYS = {
+        ContentType.MOD: "mods",
+        ContentType.RESOURCE_PACK: "resourcepacks",
+        ContentType.SHADER_PACK: "shaderpacks"
+    }
+    
     def __init__(self, minecraft_path: Path = None):
         self.minecraft_path = minecraft_path or get_default_minecraft_path()
         self.mods_path = self.minecraft_path / "mods"
@@ -156,52 +462,133 @@ class MinecraftManager:
         for path in [self.mods_path, self.resourcepacks_path, self.shaderpacks_path]:
             path.mkdir(parents=True, exist_ok=True)
         
-        # Path to our configuration file
+        ModrinthAPI.enable_cache(self.minecraft_path / "modrinth_cache.sqlite")
+        
+        # Database of installed content, and the JSON config it replaces
+        self.db_path = self.minecraft_path / "minecraft_manager.db"
         self.config_path = self.minecraft_path / "minecraft_manager_config.json"
-        self.installed_content = self._load_installed_content()
+        self.db = self._open_database()
         
-    def _load_installed_content(self) -> Dict:
-        """Load information about installed content"""
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"{Colors.YELLOW}Warning: Config file corrupted, creating new one{Colors.END}")
-        
-        # Create default structure if not exists or corrupted
-        return {
-            "mods": {},
-            "resourcepacks": {},
-            "shaderpacks": {}
+        # Lookup table for the per-type paths
+        self._paths = {
+            ContentType.MOD: self.mods_path,
+            ContentType.RESOURCE_PACK: self.resourcepacks_path,
+            ContentType.SHADER_PACK: self.shaderpacks_path
         }
     
-    def _save_installed_content(self):
-        """Save information about installed content"""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.installed_content, f, indent=2)
+    def _open_database(self) -> sqlite3.Connection:
+        """Open the installed content database, creating it on first run"""
+        db = sqlite3.connect(str(self.db_path))
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        
+        if db.execute("PRAGMA user_version").fetchone()[0] == 0:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS installed (
+                    content_type TEXT NOT NULL,
+                    project_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    installed_at TEXT NOT NULL,
+                    lower_name TEXT NOT NULL,
+                    PRIMARY KEY (content_type, project_id)
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS installed_name ON installed (content_type, lower_name)")
+            self._import_config(db)
+            db.execute("PRAGMA user_version = 1")
+            db.commit()
+        return db
+    
+    def _import_config(self, db: sqlite3.Connection):
+        """Import records from the JSON config used by earlier versions"""
+        if not self.config_path.exists():
+            return
+        try:
+            installed_content = load_json(self.config_path.read_bytes())
+        except ValueError:
+            print(f"{Colors.YELLOW}Warning: Config file corrupted, not importing it{Colors.END}")
+            return
+        
+        for content_type, key in self.CONFIG_KEYS.items():
+            for project_id, info in installed_content.get(key, {}).items():
+                self._record(content_type, project_id, info, db)
+    
+    def _record(self, content_type: ContentType, project_id: str, info: Dict,
+                db: sqlite3.Connection = None):
+        """Insert or replace the record of an installed project (not committed)"""
+        db = db or self.db
+        values = (info["name"], info["version"], info["filename"], info["installed_at"],
+                  info["name"].lower(), content_type.value, project_id)
+        
+        # Update in place to keep the rowid (install order); UPSERT would need SQLite 3.24+
+        cursor = db.execute(
+            """
+            UPDATE installed
+            SET name = ?, version = ?, filename = ?, installed_at = ?, lower_name = ?
+            WHERE content_type = ? AND project_id = ?
+            """,
+            values
+        )
+        if cursor.rowcount == 0:
+            db.execute(
+                """
+                INSERT INTO installed (name, version, filename, installed_at, lower_name, content_type, project_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                values
+            )
+    
+    def _forget(self, content_type: ContentType, project_id: str):
+        """Delete the record of an installed project (not committed)"""
+        self.db.execute("DELETE FROM installed WHERE content_type = ? AND project_id = ?",
+                        (content_type.value, project_id))
+    
+    def _query_content(self, content_type: ContentType, where: str = "", params: tuple = ()) -> List[tuple]:
+        """Get (project_id, info) pairs of installed content of a type, in install order"""
+        self.get_content_path(content_type)  # Validates the content type
+        rows = self.db.execute(
+            "SELECT project_id, name, version, filename, installed_at FROM installed "
+            f"WHERE content_type = ? {where} ORDER BY rowid",
+            (content_type.value,) + params
+        )
+        return [(pid, {"name": name, "version": version, "filename": filename, "installed_at": installed_at})
+                for pid, name, version, filename, installed_at in rows]
+    
+    def export_installed_content(self, path: Path = None, pretty: bool = False):
+        """Export installed content to a JSON file (default: the legacy config file)"""
+        path = path or self.config_path
+        installed_content = {key: self.get_content_dict(content_type)
+                             for content_type, key in self.CONFIG_KEYS.items()}
+        data = dump_json(installed_content, pretty)
+        
+        # Write to a temporary file first so a crash never leaves a truncated file
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        print(f"{Colors.GREEN}Exported installed content to {path}{Colors.END}")
     
     def get_content_path(self, content_type: ContentType) -> Path:
         """Get the path for a content type"""
-        if content_type == ContentType.MOD:
-            return self.mods_path
-        elif content_type == ContentType.RESOURCE_PACK:
-            return self.resourcepacks_path
-        elif content_type == ContentType.SHADER_PACK:
-            return self.shaderpacks_path
-        else:
-            raise ValueError(f"Unknown content type: {content_type}")
+        try:
+            return self._paths[content_type]
+        except KeyError:
+            raise ValueError(f"Unknown content type: {content_type}") from None
     
     def get_content_dict(self, content_type: ContentType) -> Dict:
-        """Get the dictionary for a content type"""
-        if content_type == ContentType.MOD:
-            return self.installed_content["mods"]
-        elif content_type == ContentType.RESOURCE_PACK:
-            return self.installed_content["resourcepacks"]
-        elif content_type == ContentType.SHADER_PACK:
-            return self.installed_content["shaderpacks"]
-        else:
-            raise ValueError(f"Unknown content type: {content_type}")
+        """Get the installed content of a type, keyed by project ID"""
+        return dict(self._query_content(content_type))
+    
+    def _find_matches(self, content_type: ContentType, name_query: str) -> List[tuple]:
+        """Find installed content whose name contains the query (case-insensitive)"""
+        query = name_query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return self._query_content(content_type, "AND lower_name LIKE ? ESCAPE '\\'", (f"%{query}%",))
+    
+    def _list_files(self, content_type: ContentType) -> set:
+        """Get the names of all files in a content directory with a single directory read"""
+        with os.scandir(self.get_content_path(content_type)) as entries:
+            return {entry.name for entry in entries}
     
     def search(self, query: str, content_type: ContentType, game_version: str = None):
         """Search for content and display results"""
@@ -212,13 +599,24 @@ class MinecraftManager:
             print(f"{Colors.YELLOW}No results found for '{query}'{Colors.END}")
             return
         
-        print(f"\n{Colors.HEADER}{Colors.BOLD}Search Results for '{query}':{Colors.END}")
-        print(f"{Colors.UNDERLINE}{'ID':<10} {'Title':<40} {'Downloads':<10} {'Updated':<10}{Colors.END}")
-        
+        # Build the whole table and write it in one go
+        buf = [
+            f"\n{Colors.HEADER}{Colors.BOLD}Search Results for '{query}':{Colors.END}\n",
+            f"{Colors.UNDERLINE}{'ID':<10} {'Title':<40} {'Downloads':<10} {'Updated':<10}{Colors.END}\n"
+        ]
+        # Colors are spliced into the template once, not once per row
+        row_fmt = (f"{Colors.BOLD}{{index:<4}}{Colors.END} {{title:<40}} {{downloads:<10}} {{date}}\n"
+                   f"    {Colors.CYAN}{{description}}{Colors.END}\n")
         for i, item in enumerate(results["hits"], 1):
-            print(f"{Colors.BOLD}{i:<4}{Colors.END} {item['title']:<40} {item.get('downloads', 'N/A'):<10} {item.get('date_modified', 'N/A')[:10]}")
-            print(f"    {Colors.CYAN}{item['description'][:80]}...{Colors.END}" if len(item.get('description', '')) > 80 
-                  else f"    {Colors.CYAN}{item.get('description', '')}{Colors.END}")
+            description = item.get('description', '')
+            buf.append(row_fmt.format_map({
+                "index": i,
+                "title": item['title'],
+                "downloads": item.get('downloads', 'N/A'),
+                "date": item.get('date_modified', 'N/A')[:10],
+                "description": description[:80] + "..." if len(description) > 80 else description
+            }))
+        sys.stdout.write("".join(buf))
         
         # Allow user to select a result
         try:
@@ -249,12 +647,10 @@ class MinecraftManager:
         version = versions[0]
         
         # Get primary file to download
-        if not version.get("files"):
+        primary_file = get_primary_file(version.get("files", []))
+        if primary_file is None:
             print(f"{Colors.RED}No files available for download{Colors.END}")
             return
-            
-        # Find primary file
-        primary_file = next((f for f in version["files"] if f.get("primary")), version["files"][0])
         
         # Determine destination path
         content_path = self.get_content_path(content_type)
@@ -263,20 +659,20 @@ class MinecraftManager:
         
         # Download the file
         print(f"{Colors.BLUE}Downloading {filename}...{Colors.END}")
-        success = ModrinthAPI.download_file(primary_file["url"], destination)
+        success = ModrinthAPI.download_file(primary_file["url"], destination, primary_file.get("size"),
+                                            primary_file.get("hashes", {}).get("sha512"))
         
         if success:
             print(f"{Colors.GREEN}Successfully installed {project['title']} to {destination}{Colors.END}")
             
             # Update installed content records
-            content_dict = self.get_content_dict(content_type)
-            content_dict[project_id] = {
+            self._record(content_type, project_id, {
                 "name": project["title"],
                 "version": version["version_number"],
                 "filename": filename,
                 "installed_at": version["date_published"]
-            }
-            self._save_installed_content()
+            })
+            self.db.commit()
         else:
             print(f"{Colors.RED}Failed to install {project['title']}{Colors.END}")
     
@@ -288,20 +684,25 @@ class MinecraftManager:
             print(f"{Colors.YELLOW}No {content_type.value}s installed{Colors.END}")
             return
             
-        print(f"\n{Colors.HEADER}{Colors.BOLD}Installed {content_type.value}s:{Colors.END}")
-        print(f"{Colors.UNDERLINE}{'Name':<40} {'Version':<20} {'Installed Date':<20}{Colors.END}")
-        
-        for project_id, info in content_dict.items():
-            print(f"{info['name']:<40} {info['version']:<20} {info['installed_at'][:10]}")
+        buf = [
+            f"\n{Colors.HEADER}{Colors.BOLD}Installed {content_type.value}s:{Colors.END}\n",
+            f"{Colors.UNDERLINE}{'Name':<40} {'Version':<20} {'Installed Date':<20}{Colors.END}\n"
+        ]
+        for info in content_dict.values():
+            buf.append(INSTALLED_ROW_FMT.format_map({
+                "name": info["name"],
+                "version": info["version"],
+                "date": info["installed_at"][:10]
+            }))
+        sys.stdout.write("".join(buf))
     
     def uninstall(self, name_query: str, content_type: ContentType):
         """Uninstall content by name"""
-        content_dict = self.get_content_dict(content_type)
         content_path = self.get_content_path(content_type)
+        existing_files = self._list_files(content_type)
         
         # Find matching content
-        matches = [(pid, info) for pid, info in content_dict.items() 
-                  if name_query.lower() in info["name"].lower()]
+        matches = self._find_matches(content_type, name_query)
         
         if not matches:
             print(f"{Colors.YELLOW}No matching {content_type.value} found for '{name_query}'{Colors.END}")
@@ -326,7 +727,7 @@ class MinecraftManager:
         
         # Remove the file
         file_path = content_path / info["filename"]
-        if file_path.exists():
+        if info["filename"] in existing_files:
             try:
                 os.remove(file_path)
                 print(f"{Colors.GREEN}Removed {info['name']} ({file_path}){Colors.END}")
@@ -335,29 +736,33 @@ class MinecraftManager:
                 return
         
         # Update records
-        del content_dict[project_id]
-        self._save_installed_content()
+        self._forget(content_type, project_id)
+        self.db.commit()
 
     def update(self, content_type: ContentType = None, name_query: str = None):
         """Update installed content"""
-        if content_type is None:
-            # Update all content types
-            for ct in ContentType:
-                self.update(ct, name_query)
-            return
-        
-        content_dict = self.get_content_dict(content_type)
-        
+        try:
+            if content_type is None:
+                # Update all content types
+                for ct in ContentType:
+                    self._update_content_type(ct, name_query)
+            else:
+                self._update_content_type(content_type, name_query)
+        finally:
+            # Commit once per run, keeping the updates that finished if one was interrupted
+            self.db.commit()
+
+    def _update_content_type(self, content_type: ContentType, name_query: str = None):
+        """Update installed content of a single type"""
         if name_query:
             # Find matching content
-            matches = [(pid, info) for pid, info in content_dict.items() 
-                      if name_query.lower() in info["name"].lower()]
+            matches = self._find_matches(content_type, name_query)
             if not matches:
                 print(f"{Colors.YELLOW}No matching {content_type.value} found for '{name_query}'{Colors.END}")
                 return
             items_to_check = matches
         else:
-            items_to_check = list(content_dict.items())
+            items_to_check = self._query_content(content_type)
         
         if not items_to_check:
             print(f"{Colors.YELLOW}No {content_type.value}s installed to update{Colors.END}")
@@ -365,61 +770,150 @@ class MinecraftManager:
             
         print(f"{Colors.HEADER}Checking for updates for {len(items_to_check)} {content_type.value}(s)...{Colors.END}")
         
+        # Fetch the version lists of all items in a couple of batched requests
+        versions_by_project = ModrinthAPI.get_versions_bulk([pid for pid, _ in items_to_check])
+        if versions_by_project is None:
+            print(f"{Colors.RED}Could not check {content_type.value}s for updates{Colors.END}")
+            return
+        
+        pending = []
         for project_id, info in items_to_check:
-            print(f"Checking {info['name']}...", end="", flush=True)
-            
-            # Get the latest version
-            versions = ModrinthAPI.get_versions(project_id)
-            if not versions:
-                print(f"{Colors.YELLOW} No versions found{Colors.END}")
-                continue
-                
-            latest = versions[0]
-            
-            if latest["version_number"] == info["version"]:
-                print(f"{Colors.GREEN} Already up to date ({info['version']}){Colors.END}")
-                continue
-                
-            print(f"{Colors.BLUE} Update available: {info['version']} → {latest['version_number']}{Colors.END}")
-            
-            # Find primary file
-            if not latest.get("files"):
-                print(f"{Colors.RED} No files available for download{Colors.END}")
-                continue
-                
-            primary_file = next((f for f in latest["files"] if f.get("primary")), latest["files"][0])
+            print(f"Checking {info['name']}...", end="")
+            planned = self._plan_update(info, versions_by_project.get(project_id, []))
+            if planned:
+                pending.append((project_id, info) + planned)
+        
+        if not pending:
+            return
+        
+        existing_files = self._list_files(content_type)
+        if import_optional("aiohttp") is not None:
+            import asyncio
+            asyncio.run(self._download_updates_async(content_type, pending, existing_files))
+        else:
+            self._download_updates_threaded(content_type, pending, existing_files)
+
+    def _download_updates_threaded(self, content_type: ContentType, pending: List, existing_files: set):
+        """Download updates concurrently on a thread pool"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        content_path = self.get_content_path(content_type)
+        
+        # Workers only do network I/O; results are recorded on this thread,
+        # so the database is only used from the thread that opened it
+        with ThreadPoolExecutor(max_workers=ModrinthAPI.MAX_CONCURRENCY) as executor:
+            futures = {}
+            for item in pending:
+                primary_file = item[3]
+                future = executor.submit(ModrinthAPI.download_file, primary_file["url"],
+                                         content_path / primary_file["filename"],
+                                         primary_file.get("size"),
+                                         primary_file.get("hashes", {}).get("sha512"))
+                futures[future] = item
             
-            # Determine paths
-            content_path = self.get_content_path(content_type)
-            old_path = content_path / info["filename"]
-            new_filename = primary_file["filename"]
-            new_path = content_path / new_filename
+            for future in as_completed(futures):
+                project_id, info, latest, primary_file = futures[future]
+                try:
+                    success = future.result()
+                except Exception as e:
+                    # e.g. OSError writing the .part file; keep finishing the other items
+                    print(f"{Colors.RED}Error downloading file: {e}{Colors.END}")
+                    success = False
+                self._finish_update(content_type, project_id, info, latest, primary_file,
+                                    success, existing_files)
+
+    async def _download_updates_async(self, content_type: ContentType, pending: List, existing_files: set):
+        """Download updates concurrently over a shared aiohttp session"""
+        import asyncio
+        import aiohttp
+        
+        content_path = self.get_content_path(content_type)
+        semaphore = asyncio.Semaphore(ModrinthAPI.MAX_CONCURRENCY)
+        
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+        
+        headers = {"User-Agent": ModrinthAPI.USER_AGENT}
+        # No overall limit so large files are not cut off after aiohttp's default 5 minutes;
+        # stalled connections still fail
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(limited(ModrinthAPI.download_file_async(session, primary_file["url"],
+                                                          content_path / primary_file["filename"],
+                                                          primary_file.get("size"),
+                                                          primary_file.get("hashes", {}).get("sha512")))
+                  for _, _, _, primary_file in pending),
+                return_exceptions=True
+            )
+        
+        for (project_id, info, latest, primary_file), success in zip(pending, results):
+            if isinstance(success, Exception):
+                print(f"{Colors.RED}Error downloading file: {success}{Colors.END}")
+                success = False
+            self._finish_update(content_type, project_id, info, latest, primary_file,
+                                success, existing_files)
+
+    def _plan_update(self, info: Dict, versions: List[Dict]) -> Optional[tuple]:
+        """Report the update status of an item and return (latest, primary_file) if it needs one"""
+        if not versions:
+            print(f"{Colors.YELLOW} No versions found{Colors.END}")
+            return None
             
-            # Download new version
-            success = ModrinthAPI.download_file(primary_file["url"], new_path)
+        latest = versions[0]
+        
+        if latest["version_number"] == info["version"]:
+            print(f"{Colors.GREEN} Already up to date ({info['version']}){Colors.END}")
+            return None
             
-            if success:
-                # Remove old version if different filename
-                if old_path != new_path and old_path.exists():
-                    try:
-                        os.remove(old_path)
-                    except OSError:
-                        print(f"{Colors.YELLOW} Warning: Could not remove old file {old_path}{Colors.END}")
-                
-                # Update record
-                content_dict[project_id] = {
-                    "name": info["name"],
-                    "version": latest["version_number"],
-                    "filename": new_filename,
-                    "installed_at": latest["date_published"]
-                }
-                self._save_installed_content()
-                
-                print(f"{Colors.GREEN} Updated successfully{Colors.END}")
-            else:
-                print(f"{Colors.RED} Update failed{Colors.END}")
+        print(f"{Colors.BLUE} Update available: {info['version']} → {latest['version_number']}{Colors.END}")
+        
+        # Find primary file
+        primary_file = get_primary_file(latest.get("files", []))
+        if primary_file is None:
+            print(f"{Colors.RED} No files available for download{Colors.END}")
+            return None
+        return latest, primary_file
+
+    def _finish_update(self, content_type: ContentType, project_id: str, info: Dict,
+                       latest: Dict, primary_file: Dict, success: bool, existing_files: set):
+        """Replace the old file and record the new version after a download"""
+        if not success:
+            print(f"{Colors.RED} Update of {info['name']} failed{Colors.END}")
+            return
+        
+        # Determine paths
+        content_path = self.get_content_path(content_type)
+        old_path = content_path / info["filename"]
+        new_filename = primary_file["filename"]
+        new_path = content_path / new_filename
+        
+        # Remove old version if different filename
+        if old_path != new_path and info["filename"] in existing_files:
+            try:
+                os.remove(old_path)
+                existing_files.discard(info["filename"])
+            except OSError:
+                print(f"{Colors.YELLOW} Warning: Could not remove old file {old_path}{Colors.END}")
+        
+        # Update record; committed by update() once all items are done
+        self._record(content_type, project_id, {
+            "name": info["name"],
+            "version": latest["version_number"],
+            "filename": new_filename,
+            "installed_at": latest["date_published"]
+        })
+        
+        print(f"{Colors.GREEN} Updated {info['name']} successfully{Colors.END}")
 
 def main():
+    import argparse
+    
+    # Only emit ANSI codes to a terminal, and respect https://no-color.org
+    if os.environ.get("NO_COLOR") or not sys.stdout.isatty():
+        Colors.disable()
+    
     # Configure argument parser
     parser = argparse.ArgumentParser(
         description="Minecraft Manager - A tool for managing Minecraft mods, resource packs, and shader packs"
@@ -490,6 +984,19 @@ def main():
         help="Name of specific content to update (partial match)"
     )
     
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Export installed content to JSON")
+    export_parser.add_argument(
+        "--output",
+        type=Path,
+        help="File to write (default: minecraft_manager_config.json in the Minecraft directory)"
+    )
+    export_parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the exported JSON"
+    )
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -517,6 +1024,9 @@ def main():
         content_type = ContentType(args.type) if args.type else None
         manager.update(content_type, args.name)
     
+    elif args.command == "export":
+        manager.export_installed_content(args.output, args.pretty)
+    
     else:
         # No command or invalid command
         parser.print_help()